@@ -0,0 +1,165 @@
+"""
+Kernels numéricos usados pelos handlers de tarefas.
+
+Com o ``numba`` disponível, os kernels são compilados com ``@njit(cache=True)``
+e assinatura explícita: a compilação acontece na importação (erros de tipo
+aparecem cedo e a primeira tarefa não paga o custo do JIT) e o código nativo
+fica em cache no disco entre execuções. Os kernels compilados liberam o GIL
+(``nogil=True``), então chamadas feitas em threads diferentes (o pool do
+TaskProcessor) rodam em paralelo. Cada chamada é sequencial: sem
+``parallel=True``, não há um segundo nível de threads disputando os núcleos
+com o pool nem dependência de um threading layer thread-safe do numba. Sem
+``numba``, a mesma implementação roda em Python puro.
+
+Cada operação pública segue o formato pré-processamento (conversão da
+entrada) -> kernel -> pós-processamento (conversão da saída).
+
+Desenvolvido por Lucas André S
+GitHub: https://github.com/lucasandre16112000-png
+"""
+
+from typing import Dict, List, Sequence
+
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# IDs numéricos dos filtros suportados (kernels compilados operam sobre inteiros)
+FILTER_IDS = {'blur': 0, 'brightness': 1, 'contrast': 2}
+
+BRIGHTNESS_DELTA = 0.1
+CONTRAST_FACTOR = 1.2
+
+
+def _apply_filters(pixels, filter_ids):
+    """
+    Aplicar filtros em sequência sobre pixels em escala de cinza (0.0 a 1.0).
+    
+    Escrito no subconjunto de Python aceito pelo numba, para que a mesma
+    função sirva de kernel compilado e de fallback em Python puro.
+    
+    Args:
+        pixels: Valores dos pixels (array float64 ou lista de floats)
+        filter_ids: IDs dos filtros (ver FILTER_IDS)
+    
+    Returns:
+        Nova sequência de pixels filtrados
+    """
+    out = pixels.copy()
+    n = len(out)
+    
+    for fid in filter_ids:
+        if fid == 0:
+            # Blur: média móvel de 3 pontos sobre uma cópia da etapa anterior
+            src = out.copy()
+            for i in range(1, n - 1):
+                out[i] = (src[i - 1] + src[i] + src[i + 1]) / 3.0
+        elif fid == 1:
+            for i in range(n):
+                out[i] = min(1.0, out[i] + BRIGHTNESS_DELTA)
+        elif fid == 2:
+            for i in range(n):
+                out[i] = min(1.0, max(0.0, (out[i] - 0.5) * CONTRAST_FACTOR + 0.5))
+    
+    return out
+
+
+def _report_stats(values):
+    """
+    Calcular soma, mínimo e máximo em uma única passada.
+    
+    Args:
+        values: Valores numéricos (não vazio)
+    
+    Returns:
+        Tupla (total, mínimo, máximo)
+    """
+    total = 0.0
+    low = values[0]
+    high = values[0]
+    
+    for v in values:
+        total += v
+        if v < low:
+            low = v
+        if v > high:
+            high = v
+    
+    return total, low, high
+
+
+if NUMBA_AVAILABLE:
+    _apply_filters_kernel = njit(
+        'float64[:](float64[:], int64[:])',
+        cache=True, nogil=True, fastmath=True
+    )(_apply_filters)
+    _report_stats_kernel = njit(
+        'UniTuple(float64, 3)(float64[:])',
+        cache=True, nogil=True, fastmath=True
+    )(_report_stats)
+else:
+    _apply_filters_kernel = _apply_filters
+    _report_stats_kernel = _report_stats
+
+
+def apply_filters(pixels: Sequence[float], filters: Sequence[str]) -> List[float]:
+    """
+    Aplicar filtros de imagem usando o kernel mais rápido disponível.
+    
+    Args:
+        pixels: Valores dos pixels em escala de cinza (0.0 a 1.0)
+        filters: Nomes dos filtros, na ordem de aplicação
+    
+    Returns:
+        Lista de pixels filtrados
+    
+    Raises:
+        ValueError: Se algum filtro for desconhecido
+    """
+    try:
+        filter_ids = [FILTER_IDS[name] for name in filters]
+    except KeyError as e:
+        raise ValueError(f"Filtro desconhecido: {e.args[0]}") from None
+    
+    if NUMBA_AVAILABLE:
+        return _apply_filters_kernel(
+            np.asarray(pixels, dtype=np.float64),
+            np.asarray(filter_ids, dtype=np.int64)
+        ).tolist()
+    
+    return _apply_filters_kernel([float(p) for p in pixels], filter_ids)
+
+
+def aggregate_report(values: Sequence[float]) -> Dict[str, float]:
+    """
+    Agregar os valores de um relatório usando o kernel mais rápido disponível.
+    
+    Args:
+        values: Valores numéricos do relatório
+    
+    Returns:
+        Dicionário com count, total, mean, min e max
+    """
+    count = len(values)
+    
+    if count == 0:
+        return {'count': 0, 'total': 0.0, 'mean': 0.0, 'min': 0.0, 'max': 0.0}
+    
+    if NUMBA_AVAILABLE:
+        data = np.asarray(values, dtype=np.float64)
+    else:
+        data = [float(v) for v in values]
+    
+    total, low, high = _report_stats_kernel(data)
+    
+    return {
+        'count': count,
+        'total': total,
+        'mean': total / count,
+        'min': low,
+        'max': high,
+    }
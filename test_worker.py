@@ -0,0 +1,422 @@
+"""
+Testes do sistema de fila de tarefas (worker.py).
+
+Executar com: python -m pytest -q
+
+Desenvolvido por Lucas André S
+GitHub: https://github.com/lucasandre16112000-png
+"""
+
+import asyncio
+
+import pytest
+
+import worker
+from worker import (
+    Fatal,
+    ResultCache,
+    Retry,
+    Success,
+    TaskPriority,
+    TaskProcessor,
+    TaskResult,
+    TaskStatus,
+)
+
+
+_real_sleep = asyncio.sleep
+
+
+async def _instant_sleep(delay, result=None):
+    """Substituto de asyncio.sleep: cede o event loop sem esperar."""
+    return await _real_sleep(0, result)
+
+
+@pytest.fixture(autouse=True)
+def fast_sleep(monkeypatch):
+    """Backoff e handlers embutidos sem espera real."""
+    monkeypatch.setattr(asyncio, 'sleep', _instant_sleep)
+
+
+@pytest.fixture
+def processor():
+    """Processador com pool pequeno, encerrado ao fim do teste."""
+    p = TaskProcessor(max_workers=2)
+    yield p
+    p.close()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+# ============================================================================
+# FILA POR PRIORIDADE
+# ============================================================================
+
+def test_run_pending_claims_by_priority_with_prefetch():
+    """Com prefetch > 1, a ordem continua sendo prioridade e depois criação."""
+    p = TaskProcessor(max_workers=1, prefetch_multiplier=3)
+    order = []
+    
+    async def handler(payload):
+        order.append(payload['n'])
+        return {'n': payload['n']}
+    
+    p.register_handler('h', handler)
+    for n, priority in [
+        (1, TaskPriority.LOW), (2, TaskPriority.HIGH), (3, TaskPriority.MEDIUM),
+        (4, TaskPriority.HIGH), (5, TaskPriority.LOW),
+    ]:
+        p.create_task('h', {'n': n}, priority=priority)
+    
+    results = run(p.run_pending(concurrency=1))
+    p.close()
+    
+    assert order == [2, 4, 3, 1, 5]
+    assert all(r.status is TaskStatus.COMPLETED for r in results)
+    assert not p._queued and not p._pending
+
+
+def test_recreated_id_is_claimed_once(processor):
+    """ID recriado após concluir não gera claim duplicado."""
+    processor._prefetch_multiplier = 4
+    processor.register_handler('h', lambda payload: {'ok': True})
+    
+    processor.create_task('h', {}, task_id='dup')
+    run(processor.process_task('dup'))
+    processor.create_task('h', {}, task_id='dup')
+    
+    results = run(processor.run_pending(concurrency=1))
+    
+    assert [r.task_id for r in results] == ['dup']
+
+
+def test_pending_heap_is_compacted(processor):
+    """Tarefas processadas fora de run_pending não acumulam no heap."""
+    processor.register_handler('h', lambda payload: {'ok': True})
+    tasks = processor.create_tasks_bulk([('h', {}, TaskPriority.MEDIUM)] * 1000)
+    
+    run(processor.bulk_process([t.id for t in tasks]))
+    
+    assert not processor._queued
+    assert len(processor._pending) <= worker.PENDING_COMPACT_SLACK
+
+
+def test_list_tasks_keeps_creation_order(processor):
+    """Listagem filtrada segue a ordem de criação, não a de conclusão."""
+    async def handler(payload):
+        for _ in range(payload['yields']):
+            await _real_sleep(0)
+        return {}
+    
+    processor.register_handler('h', handler)
+    for i, yields in enumerate([5, 0, 2]):
+        processor.create_task('h', {'yields': yields}, task_id=f't{i}')
+    
+    run(processor.run_pending())
+    
+    assert [t.id for t in processor.list_tasks(TaskStatus.COMPLETED)] == ['t0', 't1', 't2']
+    assert [t.id for t in processor.list_tasks()] == ['t0', 't1', 't2']
+
+
+# ============================================================================
+# REPROCESSAMENTO E IDS
+# ============================================================================
+
+def test_completed_task_is_not_reprocessed(processor):
+    calls = []
+    processor.register_handler('h', lambda payload: calls.append(1) or {'ok': True})
+    task = processor.create_task('h', {})
+    
+    first = run(processor.process_task(task.id))
+    second = run(processor.process_task(task.id))
+    
+    assert calls == [1]
+    assert second is first
+
+
+def test_in_flight_task_is_not_started_twice(processor):
+    calls = []
+    
+    async def handler(payload):
+        calls.append(1)
+        await _real_sleep(0.01)
+        return {'ok': True}
+    
+    processor.register_handler('h', handler)
+    task = processor.create_task('h', {})
+    
+    async def scenario():
+        return await asyncio.gather(
+            processor.process_task(task.id),
+            processor.bulk_process([task.id]),
+        )
+    
+    single, (batched,) = run(scenario())
+    
+    assert calls == [1]
+    assert single.status is TaskStatus.COMPLETED
+    assert batched.status is TaskStatus.PROCESSING
+    assert processor.get_statistics()['completed'] == 1
+
+
+def test_live_task_id_cannot_be_reused(processor):
+    processor.register_handler('h', lambda payload: {'ok': True})
+    processor.create_task('h', {}, task_id='x')
+    
+    with pytest.raises(ValueError):
+        processor.create_task('h', {}, task_id='x')
+    
+    run(processor.process_task('x'))
+    replaced = processor.create_task('h', {}, task_id='x')
+    
+    assert processor.get_task_status('x') is replaced
+    assert processor.get_statistics()['pending'] == 1
+
+
+def test_unknown_task_fails(processor):
+    result = run(processor.process_task('missing'))
+    
+    assert result.status is TaskStatus.FAILED
+
+
+def test_generated_ids_are_fixed_length_and_ordered(processor):
+    tasks = processor.create_tasks_bulk([('h', {}, TaskPriority.LOW)] * 3)
+    ids = [t.id for t in tasks]
+    
+    assert len({len(i) for i in ids}) == 1
+    assert ids == sorted(ids)
+    assert worker._encode_id(0) == '0' * 13
+    assert worker._encode_id(2 ** 64 - 1) == 'f' + 'v' * 12
+
+
+# ============================================================================
+# CANCELAMENTO E ENCERRAMENTO
+# ============================================================================
+
+def test_cancelled_task_returns_to_pending(processor):
+    release = None
+    
+    async def handler(payload):
+        await release.wait()
+        return {'ok': True}
+    
+    processor.register_handler('h', handler)
+    task = processor.create_task('h', {})
+    
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(processor.process_task(task.id), 0.01)
+    
+    run(scenario())
+    
+    assert task.status is TaskStatus.PENDING
+    assert processor.get_statistics()['processing'] == 0
+    
+    processor.register_handler('h', lambda payload: {'ok': True})
+    results = run(processor.run_pending())
+    
+    assert [r.status for r in results] == [TaskStatus.COMPLETED]
+
+
+def test_cancelled_worker_requeues_claimed_tasks():
+    p = TaskProcessor(max_workers=1, prefetch_multiplier=3)
+    release = None
+    
+    async def handler(payload):
+        await release.wait()
+        return {'ok': True}
+    
+    p.register_handler('h', handler)
+    tasks = [p.create_task('h', {}) for _ in range(3)]
+    
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(p.run_pending(concurrency=1), 0.01)
+    
+    run(scenario())
+    
+    assert all(t.status is TaskStatus.PENDING for t in tasks)
+    assert len(p._queued) == 3
+    
+    p.register_handler('h', lambda payload: {'ok': True})
+    assert len(run(p.run_pending())) == 3
+    p.close()
+
+
+def test_closed_processor_rejects_work():
+    p = TaskProcessor(max_workers=1)
+    task = p.create_task('send_email', {'to': 'a@b.c'})
+    p.close()
+    
+    with pytest.raises(RuntimeError):
+        run(p.process_task(task.id))
+    with pytest.raises(RuntimeError):
+        run(p.run_pending())
+
+
+# ============================================================================
+# RETORNO DOS HANDLERS
+# ============================================================================
+
+def test_retry_then_success(processor):
+    attempts = []
+    
+    def handler(payload):
+        attempts.append(1)
+        if len(attempts) < 3:
+            return Retry("HTTP 429", delay=0)
+        return Success({'attempts': len(attempts)})
+    
+    processor.register_handler('h', handler)
+    task = processor.create_task('h', {})
+    
+    result = run(processor.process_task(task.id))
+    
+    assert result.status is TaskStatus.COMPLETED
+    assert result.result == {'attempts': 3}
+    assert task.retry_count == 2
+
+
+def test_retry_subclass_is_retried(processor):
+    class RateLimited(Retry):
+        pass
+    
+    attempts = []
+    
+    def handler(payload):
+        attempts.append(1)
+        return RateLimited("429") if len(attempts) == 1 else {'ok': True}
+    
+    processor.register_handler('h', handler)
+    task = processor.create_task('h', {})
+    
+    result = run(processor.process_task(task.id))
+    
+    assert result.result == {'ok': True}
+    assert task.retry_count == 1
+
+
+def test_fatal_fails_without_retry(processor):
+    calls = []
+    
+    async def handler(payload):
+        calls.append(1)
+        return Fatal("payload inválido")
+    
+    processor.register_handler('h', handler)
+    task = processor.create_task('h', {})
+    
+    result = run(processor.process_task(task.id))
+    
+    assert result.status is TaskStatus.FAILED
+    assert result.error == "payload inválido"
+    assert calls == [1]
+
+
+def test_exception_is_retried_until_max_retries(processor):
+    calls = []
+    
+    def handler(payload):
+        calls.append(1)
+        raise ConnectionError("timeout")
+    
+    processor.register_handler('h', handler)
+    task = processor.create_task('h', {})
+    
+    result = run(processor.process_task(task.id))
+    
+    assert result.status is TaskStatus.FAILED
+    assert result.error == "timeout"
+    assert len(calls) == task.max_retries + 1
+
+
+def test_negative_max_retries_runs_once(processor):
+    processor.register_handler('h', lambda payload: Retry("falhou"))
+    task = processor.create_task('h', {})
+    task.max_retries = -1
+    
+    result = run(processor.process_task(task.id))
+    
+    assert result.status is TaskStatus.FAILED
+    assert task.retry_count == 0
+
+
+def test_awaitable_returned_by_callable_object(processor):
+    class AsyncHandler:
+        async def __call__(self, payload):
+            return Success({'ok': True})
+    
+    processor.register_handler('h', AsyncHandler())
+    task = processor.create_task('h', {})
+    
+    result = run(processor.process_task(task.id))
+    
+    assert result.result == {'ok': True}
+
+
+def test_unknown_filter_is_fatal(processor):
+    task = processor.create_task(
+        'process_image',
+        {'image_path': 'x.jpg', 'pixels': [0.5], 'filters': ['sepia']}
+    )
+    
+    result = run(processor.process_task(task.id))
+    
+    assert result.status is TaskStatus.FAILED
+    assert task.retry_count == 0
+
+
+# ============================================================================
+# CACHE DE RESULTADOS E SERIALIZAÇÃO
+# ============================================================================
+
+def _result(task_id):
+    return TaskResult(task_id=task_id, status=TaskStatus.COMPLETED, result={})
+
+
+def test_result_cache_maxsize():
+    cache = ResultCache(maxsize=2, ttl=60)
+    for task_id in ('a', 'b', 'c'):
+        cache[task_id] = _result(task_id)
+    
+    assert 'a' not in cache
+    assert [k for k, _ in cache.items()] == ['b', 'c']
+    assert len(cache) == 2
+
+
+def test_result_cache_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(worker, '_monotonic', lambda: now[0])
+    cache = ResultCache(maxsize=10, ttl=5)
+    cache['a'] = _result('a')
+    
+    assert cache.get('a') is not None
+    
+    now[0] += 5
+    
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_expired_result_is_rebuilt_from_task(processor):
+    processor._results = ResultCache(maxsize=0)
+    processor.register_handler('h', lambda payload: {'ok': True})
+    task = processor.create_task('h', {})
+    run(processor.process_task(task.id))
+    
+    assert processor.get_task_result(task.id) is None
+    
+    result = run(processor.process_task(task.id))
+    
+    assert result.status is TaskStatus.COMPLETED
+    assert result.result == {'ok': True}
+
+
+def test_dumps_accepts_non_str_keys():
+    assert worker._dumps({200: 'é'}) == '{"200":"é"}'.encode()
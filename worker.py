@@ -6,7 +6,7 @@ demonstrando as melhores práticas em arquitetura de sistemas distribuídos.
 
 Funcionalidades:
 - Enfileiramento de tarefas com priorização
-- Processamento assíncrono com handlers modulares
+- Processamento assíncrono (asyncio) com handlers modulares
 - Retry automático com exponential backoff
 - Logging estruturado e monitoramento
 - Estatísticas detalhadas de execução
@@ -15,13 +15,30 @@ Desenvolvido por Lucas André S
 GitHub: https://github.com/lucasandre16112000-png
 """
 
+import asyncio
+import heapq
+import inspect
+import itertools
 import json
 import logging
+import os
+import random
+import sys
 import time
-from dataclasses import asdict, dataclass, field
-from datetime import datetime
-from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from kernels import NUMBA_AVAILABLE, aggregate_report, apply_filters
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 # ============================================================================
@@ -48,32 +65,149 @@ def _configure_logging(level: int = logging.INFO) -> logging.Logger:
 
 logger = _configure_logging()
 
+# Teto (em segundos) do exponential backoff entre tentativas
+MAX_BACKOFF = 30
+
+# Entradas obsoletas toleradas no heap de pendentes antes de compactá-lo
+PENDING_COMPACT_SLACK = 64
+
+# Limites do cache de resultados: quantidade máxima e validade (segundos)
+RESULT_CACHE_MAXSIZE = 10_000
+RESULT_TTL = 3600
+
+_UTC = timezone.utc
+
+# Referências locais do módulo: evitam a busca ``time.<attr>`` a cada chamada
+_now = time.time
+_perf = time.perf_counter
+_monotonic = time.monotonic
+
+
+def _now_iso() -> str:
+    """
+    Obter o horário atual em ISO 8601 (UTC).
+    
+    Returns:
+        Timestamp formatado em ISO 8601
+    """
+    return datetime.now(_UTC).isoformat()
+
+
+def _fast_iso(timestamp: float) -> str:
+    """
+    Converter um timestamp capturado com ``time.time()`` para ISO 8601 (UTC).
+    
+    Os modelos guardam timestamps como float; a formatação só acontece
+    na exibição/serialização.
+    
+    Args:
+        timestamp: Segundos desde a epoch
+        
+    Returns:
+        Timestamp formatado em ISO 8601
+    """
+    return datetime.fromtimestamp(timestamp, tz=_UTC).isoformat()
+
+
+# Alfabeto base32 em ordem ASCII: IDs de mesmo tamanho ordenam como os números
+_ID_ALPHABET = '0123456789abcdefghijklmnopqrstuv'
+
+
+def _encode_id(number: int) -> str:
+    """
+    Codificar um inteiro de 64 bits em base32 de tamanho fixo (13 caracteres).
+    
+    Args:
+        number: Valor entre 0 e 2**64 - 1
+        
+    Returns:
+        ID codificado, ordenável lexicograficamente
+    """
+    alphabet = _ID_ALPHABET
+    chars = [''] * 13
+    
+    for i in range(12, -1, -1):
+        chars[i] = alphabet[number & 31]
+        number >>= 5
+    
+    return ''.join(chars)
+
+
+def _dumps(obj: Any, pretty: bool = False) -> bytes:
+    """
+    Serializar um objeto em JSON (UTF-8), usando ``orjson`` se disponível.
+    
+    Args:
+        obj: Objeto a serializar
+        pretty: Indentar a saída para leitura humana
+        
+    Returns:
+        JSON em bytes
+    """
+    # Os dois caminhos aceitam chaves não-str e emitem UTF-8 sem escapes
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+    
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode()
+
 
 # ============================================================================
 # ENUMS E TIPOS
 # ============================================================================
 
-class TaskStatus(Enum):
-    """Estados possíveis de uma tarefa no sistema."""
-    PENDING = "pending"
-    PROCESSING = "processing"
-    COMPLETED = "completed"
-    FAILED = "failed"
-    RETRYING = "retrying"
+class TaskStatus(IntEnum):
+    """
+    Estados possíveis de uma tarefa no sistema.
+    
+    Valores inteiros para comparações rápidas; para exibição/serialização
+    use ``status.name.lower()``.
+    """
+    PENDING = 0
+    PROCESSING = 1
+    COMPLETED = 2
+    FAILED = 3
+    RETRYING = 4
 
 
-class TaskPriority(Enum):
+class TaskPriority(IntEnum):
     """Níveis de prioridade para processamento de tarefas."""
     LOW = 3
     MEDIUM = 2
     HIGH = 1
 
 
+# Prioridades na ordem de processamento (HIGH primeiro)
+_PRIORITY_ORDER = sorted(TaskPriority)
+
+# Aliases dos status para os caminhos quentes (LOAD_GLOBAL em vez de LOAD_ATTR)
+_PENDING = TaskStatus.PENDING
+_PROCESSING = TaskStatus.PROCESSING
+_COMPLETED = TaskStatus.COMPLETED
+_FAILED = TaskStatus.FAILED
+_RETRYING = TaskStatus.RETRYING
+
+# Status de tarefa em execução (não pode ser iniciada de novo)
+_IN_FLIGHT_STATUSES = frozenset((_PROCESSING, _RETRYING))
+
+# Status em que a tarefa ainda não terminou (não pode ser substituída)
+_LIVE_STATUSES = _IN_FLIGHT_STATUSES | {_PENDING}
+
+
 # ============================================================================
 # MODELOS DE DADOS
 # ============================================================================
 
-@dataclass
+# __slots__ (sem __dict__ por instância) quando suportado pelo dataclass (3.10+)
+_DATACLASS_OPTIONS: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Task:
     """
     Modelo representando uma tarefa no sistema.
@@ -84,29 +218,72 @@ class Task:
         payload: Dados específicos para processamento
         priority: Nível de prioridade (HIGH, MEDIUM, LOW)
         status: Estado atual da tarefa
-        created_at: Timestamp de criação
-        started_at: Timestamp de início do processamento
-        completed_at: Timestamp de conclusão
+        created_at: Timestamp (``time.time()``) de criação
+        started_at: Timestamp (``time.time()``) de início do processamento
+        completed_at: Timestamp (``time.time()``) de conclusão
         result: Resultado do processamento
         error: Mensagem de erro (se houver)
         retry_count: Número de tentativas realizadas
         max_retries: Número máximo de tentativas
+        handler_id: Índice do handler na tabela de despacho (-1 se desconhecido)
     """
     id: str
     name: str
     payload: Dict[str, Any]
     priority: TaskPriority = TaskPriority.MEDIUM
     status: TaskStatus = TaskStatus.PENDING
-    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
-    started_at: Optional[str] = None
-    completed_at: Optional[str] = None
+    created_at: float = field(default_factory=_now)
+    started_at: Optional[float] = None
+    completed_at: Optional[float] = None
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
     retry_count: int = 0
     max_retries: int = 3
+    handler_id: int = field(default=-1, repr=False, compare=False)
+    
+    @property
+    def created_at_iso(self) -> str:
+        """Timestamp de criação em ISO 8601."""
+        return _fast_iso(self.created_at)
+    
+    @property
+    def started_at_iso(self) -> Optional[str]:
+        """Timestamp de início em ISO 8601 (None se não iniciada)."""
+        return _fast_iso(self.started_at) if self.started_at is not None else None
+    
+    @property
+    def completed_at_iso(self) -> Optional[str]:
+        """Timestamp de conclusão em ISO 8601 (None se não concluída)."""
+        return _fast_iso(self.completed_at) if self.completed_at is not None else None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converter a tarefa em dicionário serializável.
+        
+        Diferente de ``asdict``, não copia ``payload`` nem ``result``: o
+        dicionário referencia os mesmos objetos, que não devem ser
+        alterados enquanto a serialização estiver em uso.
+        
+        Returns:
+            Dicionário com os campos da tarefa
+        """
+        return {
+            'id': self.id,
+            'name': self.name,
+            'payload': self.payload,
+            'priority': self.priority.name,
+            'status': self.status.name.lower(),
+            'created_at': self.created_at_iso,
+            'started_at': self.started_at_iso,
+            'completed_at': self.completed_at_iso,
+            'result': self.result,
+            'error': self.error,
+            'retry_count': self.retry_count,
+            'max_retries': self.max_retries,
+        }
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class TaskResult:
     """
     Modelo representando o resultado de uma tarefa processada.
@@ -117,14 +294,240 @@ class TaskResult:
         result: Dados retornados pelo handler
         error: Mensagem de erro (se houver)
         execution_time: Tempo de execução em segundos
-        completed_at: Timestamp de conclusão
+        completed_at: Timestamp (``time.time()``) de conclusão
     """
     task_id: str
     status: TaskStatus
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
     execution_time: float = 0.0
-    completed_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    completed_at: float = field(default_factory=_now)
+    
+    @property
+    def completed_at_iso(self) -> str:
+        """Timestamp de conclusão em ISO 8601."""
+        return _fast_iso(self.completed_at)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converter o resultado em dicionário serializável.
+        
+        Não copia ``result`` (ver ``Task.to_dict``).
+        
+        Returns:
+            Dicionário com os campos do resultado
+        """
+        return {
+            'task_id': self.task_id,
+            'status': self.status.name.lower(),
+            'result': self.result,
+            'error': self.error,
+            'execution_time': self.execution_time,
+            'completed_at': self.completed_at_iso,
+        }
+    
+    def to_json(self) -> bytes:
+        """
+        Serializar o resultado em JSON compacto (UTF-8).
+        
+        Usa ``orjson`` quando disponível (ver ``_dumps``); os campos são os
+        de ``to_dict``.
+        
+        Returns:
+            JSON do resultado em bytes
+        """
+        return _dumps(self.to_dict())
+
+
+# ============================================================================
+# RETORNO DOS HANDLERS
+# ============================================================================
+
+@dataclass(**_DATACLASS_OPTIONS)
+class Success:
+    """
+    Retorno de handler: processamento concluído.
+    
+    Attributes:
+        result: Dados do resultado
+    """
+    result: Dict[str, Any]
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class Retry:
+    """
+    Retorno de handler: falha temporária, a tarefa deve ser repetida.
+    
+    Attributes:
+        reason: Motivo da falha
+        delay: Espera (segundos) antes da próxima tentativa; None usa o
+            exponential backoff padrão
+    """
+    reason: str
+    delay: Optional[float] = None
+
+
+@dataclass(**_DATACLASS_OPTIONS)
+class Fatal:
+    """
+    Retorno de handler: falha definitiva, sem novas tentativas.
+    
+    Attributes:
+        error: Mensagem de erro
+    """
+    error: str
+
+
+HandlerOutcome = Union[Success, Retry, Fatal]
+
+# Handler de tarefa: recebe o payload e retorna um HandlerOutcome (ou apenas
+# o dicionário de resultado, equivalente a Success). Pode ser uma coroutine
+# (``async def``) ou uma função síncrona, executada em threads.
+TaskHandler = Callable[
+    [Dict[str, Any]],
+    Union[HandlerOutcome, Dict[str, Any], Awaitable[Union[HandlerOutcome, Dict[str, Any]]]]
+]
+
+
+# ============================================================================
+# CACHE DE RESULTADOS
+# ============================================================================
+
+class ResultCache:
+    """
+    Cache limitado de resultados com expiração por tempo (TTL).
+    
+    Substitui um dict sem limite de objetos TaskResult. Apenas esses
+    registros são limitados: a tarefa continua em ``TaskProcessor`` com o
+    dicionário de resultado em ``Task.result``, de onde o TaskResult é
+    reconstruído após expirar. Como todas as entradas têm a mesma validade,
+    a ordem de inserção é também a ordem de expiração: a limpeza remove
+    apenas do início, em O(1) amortizado, sem varreduras.
+    """
+    
+    def __init__(
+        self,
+        maxsize: int = RESULT_CACHE_MAXSIZE,
+        ttl: float = RESULT_TTL
+    ) -> None:
+        """
+        Inicializar o cache.
+        
+        Args:
+            maxsize: Número máximo de resultados mantidos
+            ttl: Validade de cada resultado em segundos
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, TaskResult]]" = OrderedDict()
+    
+    def __setitem__(self, task_id: str, result: TaskResult) -> None:
+        data = self._data
+        data.pop(task_id, None)
+        data[task_id] = (_monotonic() + self.ttl, result)
+        self._evict()
+    
+    def __contains__(self, task_id: str) -> bool:
+        return self.get(task_id) is not None
+    
+    def __len__(self) -> int:
+        self._evict()
+        return len(self._data)
+    
+    def get(self, task_id: str, default: Optional[TaskResult] = None) -> Optional[TaskResult]:
+        """
+        Obter um resultado ainda válido.
+        
+        Args:
+            task_id: ID da tarefa
+            default: Valor retornado se ausente ou expirado
+            
+        Returns:
+            TaskResult ou default
+        """
+        entry = self._data.get(task_id)
+        
+        if entry is None:
+            return default
+        
+        expires_at, result = entry
+        if expires_at <= _monotonic():
+            del self._data[task_id]
+            return default
+        
+        return result
+    
+    def update(self, results: Dict[str, TaskResult]) -> None:
+        """
+        Inserir um lote de resultados.
+        
+        Args:
+            results: Resultados indexados pelo ID da tarefa
+        """
+        data = self._data
+        expires_at = _monotonic() + self.ttl
+        
+        for task_id, result in results.items():
+            data.pop(task_id, None)
+            data[task_id] = (expires_at, result)
+        
+        self._evict()
+    
+    def items(self) -> Iterator[Tuple[str, TaskResult]]:
+        """
+        Iterar sobre os resultados válidos, do mais antigo ao mais recente.
+        
+        Returns:
+            Iterador de pares (task_id, TaskResult)
+        """
+        self._evict()
+        return ((task_id, result) for task_id, (_, result) in self._data.items())
+    
+    def _evict(self) -> None:
+        """Remover do início as entradas expiradas ou além de maxsize."""
+        data = self._data
+        now = _monotonic()
+        
+        while data:
+            expires_at, _ = next(iter(data.values()))
+            if len(data) <= self.maxsize and expires_at > now:
+                break
+            data.popitem(last=False)
+
+
+# ============================================================================
+# BACKEND DE PERSISTÊNCIA
+# ============================================================================
+
+class TaskBackend:
+    """
+    Ponto de extensão para persistir tarefas fora da memória do processo.
+    
+    A implementação padrão não faz nada: o estado fica apenas no
+    TaskProcessor. Backends reais (Redis, banco de dados) sobrescrevem os
+    métodos e recebem cada lote inteiro de uma vez, podendo gravá-lo com
+    uma única ida ao servidor (ex.: ``redis.pipeline()``).
+    """
+    
+    def save_tasks(self, tasks: List[Task]) -> None:
+        """
+        Persistir um lote de tarefas recém-criadas.
+        
+        Args:
+            tasks: Tarefas criadas
+        """
+    
+    def save_results(self, results: Dict[str, TaskResult]) -> None:
+        """
+        Persistir um lote de resultados.
+        
+        Backends com expiração devem usar a mesma validade do cache em
+        memória (ex.: ``EXPIRE result:<task_id> RESULT_TTL`` no Redis).
+        
+        Args:
+            results: Resultados indexados pelo ID da tarefa
+        """
 
 
 # ============================================================================
@@ -139,30 +542,87 @@ class TaskProcessor:
     processamento, incluindo tratamento de erros e retry automático.
     """
     
-    def __init__(self) -> None:
-        """Inicializar o processador de tarefas."""
+    def __init__(
+        self,
+        backend: Optional[TaskBackend] = None,
+        id_prefix: str = "task",
+        max_workers: Optional[int] = None,
+        prefetch_multiplier: Optional[int] = None
+    ) -> None:
+        """
+        Inicializar o processador de tarefas.
+        
+        Args:
+            backend: Backend de persistência (padrão: apenas em memória)
+            id_prefix: Prefixo dos IDs gerados; use um por worker para
+                evitar colisões entre processos (ex.: "w3")
+            max_workers: Threads do pool para handlers síncronos
+                (padrão: variável TASKQ_CONCURRENCY ou 8)
+            prefetch_multiplier: Tarefas que cada worker de ``run_pending``
+                retira da fila por vez (padrão: variável
+                TASKQ_PREFETCH_MULTIPLIER ou 1)
+        """
+        if max_workers is None:
+            max_workers = int(os.getenv('TASKQ_CONCURRENCY', '8'))
+        if prefetch_multiplier is None:
+            prefetch_multiplier = int(os.getenv('TASKQ_PREFETCH_MULTIPLIER', '1'))
+        
+        self._backend = backend or TaskBackend()
+        # Pool compartilhado por todas as chamadas; threads são criadas sob demanda
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._closed = False
+        self._concurrency = max_workers
+        self._prefetch_multiplier = prefetch_multiplier
+        self._id_prefix = id_prefix
+        # Semente em milissegundos (<< 20): IDs não se repetem entre reinícios
+        self._id_counter = itertools.count(int(_now() * 1000) << 20)
         self._tasks: Dict[str, Task] = {}
-        self._results: Dict[str, TaskResult] = {}
-        self._handlers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
-            'send_email': self._handle_send_email,
-            'generate_report': self._handle_generate_report,
-            'process_image': self._handle_process_image,
-            'sync_data': self._handle_sync_data,
-            'cleanup': self._handle_cleanup,
+        self._results = ResultCache()
+        # Índices mantidos a cada transição: listagem sem sort e contagem em O(1)
+        # _by_priority: ID -> sequência de criação, em ordem de criação, por prioridade
+        # _by_status: status -> prioridade -> tarefas (ordem de entrada no status)
+        self._by_priority: Dict[TaskPriority, Dict[str, int]] = {p: {} for p in TaskPriority}
+        self._creation_seq = itertools.count()
+        self._by_status: Dict[TaskStatus, Dict[TaskPriority, Dict[str, Task]]] = {
+            s: {p: {} for p in TaskPriority} for s in TaskStatus
         }
-        logger.info("TaskProcessor inicializado")
+        # Fila de pendentes: heap de (prioridade, sequência, ID). _queued guarda
+        # a sequência da entrada válida de cada ID; as demais são obsoletas e
+        # são descartadas ao serem retiradas ou quando o heap é compactado
+        self._pending: List[Tuple[TaskPriority, int, str]] = []
+        self._pending_seq = itertools.count()
+        self._queued: Dict[str, int] = {}
+        self._completed_time_sum: float = 0.0
+        self._completed_count: int = 0
+        # Despacho por índice: nome -> ID resolvido na criação da tarefa
+        self._handler_ids: Dict[str, int] = {}
+        self._handler_table: Tuple[TaskHandler, ...] = ()
+        for name, handler in (
+            ('send_email', self._handle_send_email),
+            ('generate_report', self._handle_generate_report),
+            ('process_image', self._handle_process_image),
+            ('sync_data', self._handle_sync_data),
+            ('cleanup', self._handle_cleanup),
+        ):
+            self._bind_handler(name, handler)
+        logger.info(
+            "TaskProcessor inicializado (kernels: %s)",
+            'numba' if NUMBA_AVAILABLE else 'python'
+        )
     
     def register_handler(
         self,
         task_name: str,
-        handler: Callable[[Dict[str, Any]], Dict[str, Any]]
+        handler: TaskHandler
     ) -> None:
         """
         Registrar um handler customizado para um tipo de tarefa.
         
         Args:
             task_name: Nome do tipo de tarefa
-            handler: Função que processa a tarefa
+            handler: Função que processa a tarefa; ``async def`` roda no
+                event loop, funções síncronas (I/O bloqueante) rodam em um
+                pool de threads
             
         Raises:
             ValueError: Se task_name ou handler for inválido
@@ -170,8 +630,29 @@ class TaskProcessor:
         if not task_name or not callable(handler):
             raise ValueError("task_name e handler devem ser válidos")
         
-        self._handlers[task_name] = handler
-        logger.info(f"Handler registrado para tarefa: {task_name}")
+        self._bind_handler(task_name, handler)
+        logger.info("Handler registrado para tarefa: %s", task_name)
+    
+    def _bind_handler(self, task_name: str, handler: TaskHandler) -> None:
+        """
+        Associar um handler a um ID na tabela de despacho.
+        
+        Um nome já registrado mantém seu ID, apenas trocando o handler.
+        
+        Args:
+            task_name: Nome do tipo de tarefa
+            handler: Função que processa a tarefa
+        """
+        table = list(self._handler_table)
+        handler_id = self._handler_ids.get(task_name)
+        
+        if handler_id is None:
+            self._handler_ids[task_name] = len(table)
+            table.append(handler)
+        else:
+            table[handler_id] = handler
+        
+        self._handler_table = tuple(table)
     
     def create_task(
         self,
@@ -193,139 +674,636 @@ class TaskProcessor:
             Task criada
             
         Raises:
-            ValueError: Se name ou payload for inválido
+            ValueError: Se name ou payload for inválido, ou se task_id
+                pertencer a uma tarefa ainda não finalizada
         """
         if not name or not isinstance(payload, dict):
             raise ValueError("name e payload devem ser válidos")
         
         if task_id is None:
-            task_id = f"task_{int(time.time() * 1000)}"
+            task_id = f"{self._id_prefix}_{_encode_id(next(self._id_counter))}"
         
         task = Task(
             id=task_id,
             name=name,
             payload=payload,
-            priority=priority
+            priority=priority,
+            handler_id=self._handler_ids.get(name, -1)
         )
         
-        self._tasks[task_id] = task
-        logger.info(f"Tarefa criada: {task_id} (tipo: {name}, prioridade: {priority.name})")
+        self._add_task(task)
+        self._backend.save_tasks([task])
+        # Guard: evita até o acesso a priority.name quando INFO está desligado
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Tarefa criada: %s (tipo: %s, prioridade: %s)",
+                task_id, name, priority.name
+            )
         
         return task
     
-    def process_task(self, task_id: str) -> TaskResult:
+    def create_tasks_bulk(
+        self,
+        specs: List[Tuple[str, Dict[str, Any], TaskPriority]]
+    ) -> List[Task]:
+        """
+        Criar várias tarefas de uma vez.
+        
+        Todas as especificações são validadas antes de qualquer tarefa ser
+        criada. O lote é entregue ao backend em uma única chamada e gera
+        uma única linha de log.
+        
+        Args:
+            specs: Tuplas (name, payload, priority) de cada tarefa
+            
+        Returns:
+            Lista de Tasks criadas, na ordem de specs
+            
+        Raises:
+            ValueError: Se algum name ou payload for inválido
+        """
+        for name, payload, _ in specs:
+            if not name or not isinstance(payload, dict):
+                raise ValueError("name e payload devem ser válidos")
+        
+        prefix = self._id_prefix
+        counter = self._id_counter
+        handler_ids = self._handler_ids
+        
+        tasks = [
+            Task(
+                id=f"{prefix}_{_encode_id(next(counter))}",
+                name=name,
+                payload=payload,
+                priority=priority,
+                handler_id=handler_ids.get(name, -1)
+            )
+            for name, payload, priority in specs
+        ]
+        
+        for task in tasks:
+            self._add_task(task)
+        
+        self._backend.save_tasks(tasks)
+        logger.info("Tarefas criadas em lote: %d", len(tasks))
+        
+        return tasks
+    
+    def _add_task(self, task: Task) -> None:
+        """
+        Armazenar uma tarefa e registrá-la nos índices.
+        
+        Uma tarefa finalizada (COMPLETED ou FAILED) com o mesmo ID é
+        substituída.
+        
+        Args:
+            task: Tarefa a armazenar
+            
+        Raises:
+            ValueError: Se já existir tarefa não finalizada com o mesmo ID
+        """
+        task_id = task.id
+        previous = self._tasks.get(task_id)
+        if previous is not None:
+            # Tarefa em andamento continua referenciada por quem a processa
+            if previous.status in _LIVE_STATUSES:
+                raise ValueError(f"Já existe tarefa não finalizada com ID: {task_id}")
+            del self._by_priority[previous.priority][task_id]
+            del self._by_status[previous.status][previous.priority][task_id]
+        
+        self._tasks[task_id] = task
+        self._by_priority[task.priority][task_id] = next(self._creation_seq)
+        self._by_status[task.status][task.priority][task_id] = task
+        
+        if task.status is _PENDING:
+            self._enqueue(task)
+    
+    def _enqueue(self, task: Task) -> None:
+        """
+        Colocar uma tarefa PENDING no heap de pendentes.
+        
+        Args:
+            task: Tarefa pendente
+        """
+        seq = next(self._pending_seq)
+        self._queued[task.id] = seq
+        heapq.heappush(self._pending, (task.priority, seq, task.id))
+    
+    def _requeue(self, task: Task) -> None:
+        """
+        Devolver à fila uma tarefa cuja execução foi interrompida.
+        
+        Args:
+            task: Tarefa retirada da fila ou em execução
+        """
+        if task.status is not _PENDING:
+            self._set_status(task, _PENDING)
+        
+        if task.id not in self._queued:
+            self._enqueue(task)
+    
+    def _claim_pending(self, limit: int) -> List[Task]:
+        """
+        Retirar da fila até ``limit`` tarefas pendentes, HIGH primeiro.
+        
+        Args:
+            limit: Quantidade máxima de tarefas
+            
+        Returns:
+            Tarefas retiradas, em ordem de prioridade e de criação
+        """
+        pending = self._pending
+        queued = self._queued
+        tasks = self._tasks
+        claimed: List[Task] = []
+        
+        while pending and len(claimed) < limit:
+            _, seq, task_id = heapq.heappop(pending)
+            
+            # Entrada obsoleta: tarefa processada por outro caminho ou recriada
+            if queued.get(task_id) != seq:
+                continue
+            
+            del queued[task_id]
+            claimed.append(tasks[task_id])
+        
+        return claimed
+    
+    def _compact_pending(self) -> None:
+        """Remover do heap de pendentes as entradas obsoletas."""
+        queued = self._queued
+        self._pending = [
+            entry for entry in self._pending if queued.get(entry[2]) == entry[1]
+        ]
+        heapq.heapify(self._pending)
+    
+    async def process_task(self, task_id: str) -> TaskResult:
         """
         Processar uma tarefa usando seu handler correspondente.
         
         Implementa lógica de retry com exponential backoff em caso de falha.
+        A espera entre tentativas usa ``asyncio.sleep``, liberando o event
+        loop para as demais tarefas em andamento.
         
         Args:
             task_id: ID da tarefa a processar
             
         Returns:
             TaskResult com resultado ou erro
+            
+        Raises:
+            RuntimeError: Se o processador já foi encerrado
         """
-        if task_id not in self._tasks:
-            logger.error(f"Tarefa não encontrada: {task_id}")
-            return TaskResult(
-                task_id=task_id,
-                status=TaskStatus.FAILED,
-                error="Tarefa não encontrada"
-            )
+        self._ensure_open()
+        skipped = self._precheck(task_id)
+        
+        if skipped is not None:
+            return skipped
         
         task = self._tasks[task_id]
+        logger.info("Iniciando processamento: %s (tipo: %s)", task_id, task.name)
         
-        # Evitar reprocessamento
-        if task.status == TaskStatus.COMPLETED:
-            logger.warning(f"Tarefa já foi processada: {task_id}")
-            return self._results.get(task_id)
+        start_time = _perf()
+        self._set_status(task, _PROCESSING)
+        task.started_at = _now()
         
-        logger.info(f"Iniciando processamento: {task_id} (tipo: {task.name})")
+        task_result = await self._execute(task, start_time)
+        self._commit_results({task_id: task_result})
         
-        task.status = TaskStatus.PROCESSING
-        task.started_at = datetime.utcnow().isoformat()
+        return task_result
+    
+    async def bulk_process(self, task_ids: List[str]) -> List[TaskResult]:
+        """
+        Processar um lote de tarefas com transições e gravação agrupadas.
         
-        start_time = time.time()
+        Valida todos os IDs em uma única passada, marca o lote inteiro como
+        PROCESSING de uma vez, executa os handlers concorrentemente e grava
+        todos os resultados em um único commit (incluindo o backend).
+        Handlers síncronos do lote rodam em paralelo no pool de threads.
         
-        try:
-            # Obter handler para tipo de tarefa
-            handler = self._handlers.get(task.name)
-            
-            if handler is None:
-                raise ValueError(f"Handler não encontrado para tipo: {task.name}")
-            
-            # Executar handler
-            result = handler(task.payload)
-            
-            execution_time = time.time() - start_time
+        Args:
+            task_ids: IDs das tarefas a processar
             
-            # Atualizar tarefa com sucesso
-            task.status = TaskStatus.COMPLETED
-            task.completed_at = datetime.utcnow().isoformat()
-            task.result = result
+        Returns:
+            Lista de TaskResult na mesma ordem de task_ids
             
-            task_result = TaskResult(
-                task_id=task_id,
-                status=TaskStatus.COMPLETED,
-                result=result,
-                execution_time=execution_time
-            )
+        Raises:
+            RuntimeError: Se o processador já foi encerrado
+        """
+        self._ensure_open()
+        results: Dict[str, TaskResult] = {}
+        batch: Dict[str, Task] = {}
+        
+        for task_id in task_ids:
+            if task_id in results or task_id in batch:
+                continue
             
-            self._results[task_id] = task_result
+            skipped = self._precheck(task_id)
             
-            logger.info(
-                f"✓ Tarefa concluída com sucesso: {task_id} "
-                f"(tempo: {execution_time:.2f}s)"
-            )
+            if skipped is not None:
+                results[task_id] = skipped
+            else:
+                batch[task_id] = self._tasks[task_id]
+        
+        logger.info("Iniciando processamento em lote: %d tarefas", len(batch))
+        
+        # Sem await entre as transições: o lote muda de status atomicamente
+        start_time = _perf()
+        started_at = _now()
+        for task in batch.values():
+            self._set_status(task, _PROCESSING)
+            task.started_at = started_at
+        
+        executed = await asyncio.gather(
+            *(self._execute(task, start_time) for task in batch.values())
+        )
+        
+        batch_results = {r.task_id: r for r in executed}
+        self._commit_results(batch_results)
+        results.update(batch_results)
+        
+        return [results[task_id] for task_id in task_ids]
+    
+    async def run(self, task_ids: List[str]) -> List[TaskResult]:
+        """
+        Processar várias tarefas concorrentemente no event loop.
+        
+        Enquanto uma tarefa aguarda I/O ou o backoff de um retry, as demais
+        continuam sendo executadas.
+        
+        Args:
+            task_ids: IDs das tarefas a processar
             
-            return task_result
+        Returns:
+            Lista de TaskResult na mesma ordem de task_ids
+        """
+        return await self.bulk_process(task_ids)
+    
+    async def run_pending(self, concurrency: Optional[int] = None) -> List[TaskResult]:
+        """
+        Processar todas as tarefas pendentes em ordem de prioridade.
+        
+        Cada worker retira da fila ``prefetch_multiplier`` tarefas por vez e
+        só volta a buscar quando termina as que pegou. Com o padrão 1, uma
+        tarefa longa não segura tarefas de maior prioridade atrás dela: elas
+        vão para o próximo worker livre.
+        
+        Args:
+            concurrency: Número de workers simultâneos (padrão: max_workers)
             
-        except Exception as e:
-            execution_time = time.time() - start_time
-            error_msg = str(e)
+        Returns:
+            Lista de TaskResult na ordem de conclusão
             
-            logger.error(f"✗ Erro ao processar tarefa {task_id}: {error_msg}")
+        Raises:
+            RuntimeError: Se o processador já foi encerrado
+        """
+        self._ensure_open()
+        if concurrency is None:
+            concurrency = self._concurrency
+        
+        prefetch = self._prefetch_multiplier
+        results: List[TaskResult] = []
+        
+        async def worker() -> None:
+            while True:
+                claimed = self._claim_pending(prefetch)
+                if not claimed:
+                    return
+                for i, task in enumerate(claimed):
+                    try:
+                        results.append(await self.process_task(task.id))
+                    except BaseException:
+                        # Worker interrompido: tarefas retiradas e ainda não
+                        # iniciadas voltam para a fila
+                        for unstarted in claimed[i + 1:]:
+                            self._requeue(unstarted)
+                        raise
+        
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        
+        return results
+    
+    def close(self) -> None:
+        """Encerrar o pool de threads, aguardando handlers em andamento."""
+        self._closed = True
+        self._pool.shutdown(wait=True)
+    
+    def _ensure_open(self) -> None:
+        """
+        Verificar se o processador ainda aceita processamento.
+        
+        Raises:
+            RuntimeError: Se ``close`` já foi chamado
+        """
+        if self._closed:
+            raise RuntimeError("TaskProcessor encerrado: crie um novo processador")
+    
+    async def _execute(self, task: Task, start_time: float) -> TaskResult:
+        """
+        Executar o handler de uma tarefa já marcada como PROCESSING.
+        
+        Interpreta o HandlerOutcome retornado: Success conclui, Fatal falha
+        sem novas tentativas e Retry repete com exponential backoff (ou com
+        o ``delay`` informado). Exceções levantadas pelo handler são tratadas
+        como Retry. Não grava o resultado; isso fica a cargo de quem chama,
+        via ``_commit_results``.
+        
+        Args:
+            task: Tarefa a executar
+            start_time: Instante (``time.perf_counter()``) de início da primeira tentativa
             
-            # Tentar retry com exponential backoff
-            if task.retry_count < task.max_retries:
-                task.retry_count += 1
-                task.status = TaskStatus.RETRYING
+        Returns:
+            TaskResult com resultado ou erro
+        """
+        # Obter handler uma única vez; handler ausente não se resolve com retry
+        handler_id = task.handler_id
+        
+        if handler_id < 0:
+            # Handler registrado depois da criação da tarefa
+            handler_id = task.handler_id = self._handler_ids.get(task.name, -1)
+        
+        if handler_id < 0:
+            error_msg = f"Handler não encontrado para tipo: {task.name}"
+            logger.error("✗ Erro ao processar tarefa %s: %s", task.id, error_msg)
+            return self._fail_task(task, error_msg, 0.0)
+        
+        handler = self._handler_table[handler_id]
+        is_async = inspect.iscoroutinefunction(handler)
+        loop = asyncio.get_running_loop()
+        
+        task_id = task.id
+        payload = task.payload
+        # max_retries negativo vale como 0: sempre há ao menos uma tentativa,
+        # o que garante error_msg/execution_time definidos após o laço
+        max_retries = max(task.max_retries, 0)
+        
+        try:
+            for attempt in range(max_retries + 1):
+                try:
+                    if is_async:
+                        returned = handler(payload)
+                    else:
+                        # I/O bloqueante fora do event loop (libera o GIL)
+                        returned = await loop.run_in_executor(self._pool, handler, payload)
+                    
+                    # Coroutine devolvida por handler que não é ``async def``
+                    # (ex.: objeto com ``async def __call__``)
+                    if inspect.isawaitable(returned):
+                        outcome = await returned
+                    else:
+                        outcome = returned
+                except Exception as e:
+                    if self._closed:
+                        # Pool encerrado durante a execução: falha de infraestrutura,
+                        # não do handler, então não há nova tentativa
+                        error_msg = "TaskProcessor encerrado durante o processamento"
+                        logger.error("✗ Erro ao processar tarefa %s: %s", task_id, error_msg)
+                        return self._fail_task(task, error_msg, _perf() - start_time)
+                    
+                    # Rede de segurança: exceção inesperada conta como falha temporária
+                    outcome = Retry(str(e))
                 
-                wait_time = 2 ** task.retry_count
-                logger.info(
-                    f"Tentando novamente ({task.retry_count}/{task.max_retries}): "
-                    f"{task_id} (aguardando {wait_time}s)"
-                )
+                execution_time = _perf() - start_time
                 
-                time.sleep(wait_time)
-                return self.process_task(task_id)
-            else:
-                # Marcar como falhada após todas as tentativas
-                task.status = TaskStatus.FAILED
-                task.error = error_msg
-                task.completed_at = datetime.utcnow().isoformat()
+                if isinstance(outcome, Success):
+                    return self._complete_task(task, outcome.result, execution_time)
                 
-                task_result = TaskResult(
-                    task_id=task_id,
-                    status=TaskStatus.FAILED,
-                    error=error_msg,
-                    execution_time=execution_time
-                )
+                if isinstance(outcome, Fatal):
+                    logger.error("✗ Erro ao processar tarefa %s: %s", task_id, outcome.error)
+                    return self._fail_task(task, outcome.error, execution_time)
                 
-                self._results[task_id] = task_result
+                if not isinstance(outcome, Retry):
+                    # Retorno simples (dicionário) equivale a Success
+                    return self._complete_task(task, outcome, execution_time)
                 
-                logger.error(
-                    f"Tarefa falhou permanentemente: {task_id} "
-                    f"(tentativas: {task.retry_count}/{task.max_retries})"
-                )
+                error_msg = outcome.reason
+                logger.error("✗ Erro ao processar tarefa %s: %s", task_id, error_msg)
                 
-                return task_result
+                # Tentar retry com exponential backoff
+                if attempt < max_retries:
+                    retry_count = attempt + 1
+                    task.retry_count = retry_count
+                    self._set_status(task, _RETRYING)
+                    
+                    wait_time = outcome.delay
+                    if wait_time is None:
+                        # Backoff exponencial com jitter (para não sincronizar
+                        # retries de tarefas que falharam juntas), limitado
+                        # a MAX_BACKOFF depois do jitter
+                        wait_time = min((1 << retry_count) * (0.5 + random.random()), MAX_BACKOFF)
+                    logger.info(
+                        "Tentando novamente (%d/%d): %s (aguardando %.1fs)",
+                        retry_count, max_retries, task_id, wait_time
+                    )
+                    
+                    await asyncio.sleep(wait_time)
+                    self._set_status(task, _PROCESSING)
+                    start_time = _perf()
+        
+        except BaseException:
+            # Execução cancelada (ex.: asyncio.wait_for) ou interrompida: a
+            # tarefa volta para PENDING em vez de ficar presa em PROCESSING
+            self._requeue(task)
+            raise
+        
+        # Marcar como falhada após todas as tentativas
+        return self._fail_task(task, error_msg, execution_time)
+    
+    def _precheck(self, task_id: str) -> Optional[TaskResult]:
+        """
+        Verificar se uma tarefa pode ser iniciada.
+        
+        Args:
+            task_id: ID da tarefa
+            
+        Returns:
+            None se a tarefa pode ser executada; caso contrário, o TaskResult
+            a devolver (tarefa inexistente, já concluída ou em andamento)
+        """
+        task = self._tasks.get(task_id)
+        
+        if task is None:
+            logger.error("Tarefa não encontrada: %s", task_id)
+            return TaskResult(
+                task_id=task_id,
+                status=_FAILED,
+                error="Tarefa não encontrada"
+            )
+        
+        # Evitar reprocessamento (e execução duplicada de tarefa em andamento)
+        if task.status is _COMPLETED:
+            logger.warning("Tarefa já foi processada: %s", task_id)
+            return self._completed_result(task)
+        
+        if task.status in _IN_FLIGHT_STATUSES:
+            logger.warning("Tarefa já está em processamento: %s", task_id)
+            return self._in_flight_result(task)
+        
+        return None
+    
+    def _completed_result(self, task: Task) -> TaskResult:
+        """
+        Obter o resultado de uma tarefa já concluída.
+        
+        Se o resultado expirou do cache, é reconstruído a partir da tarefa
+        (sem o tempo de execução, que não fica registrado nela).
+        
+        Args:
+            task: Tarefa com status COMPLETED
+            
+        Returns:
+            TaskResult da tarefa
+        """
+        cached = self._results.get(task.id)
+        
+        if cached is not None:
+            return cached
+        
+        # _complete_task grava completed_at junto com o status COMPLETED
+        completed_at = task.completed_at
+        assert completed_at is not None
+        
+        return TaskResult(
+            task_id=task.id,
+            status=_COMPLETED,
+            result=task.result,
+            completed_at=completed_at
+        )
+    
+    def _in_flight_result(self, task: Task) -> TaskResult:
+        """
+        Montar o retorno para uma tarefa que já está sendo executada.
+        
+        O resultado não é gravado: a execução em andamento gravará o seu.
+        Como a tarefa não terminou, ``completed_at`` registra apenas o
+        instante da consulta, não uma conclusão.
+        
+        Args:
+            task: Tarefa com status PROCESSING ou RETRYING
+            
+        Returns:
+            TaskResult com o status atual da tarefa
+        """
+        return TaskResult(
+            task_id=task.id,
+            status=task.status,
+            error="Tarefa já está em processamento",
+            completed_at=_now()
+        )
+    
+    def _commit_results(self, results: Dict[str, TaskResult]) -> None:
+        """
+        Gravar um lote de resultados na memória e no backend.
+        
+        Args:
+            results: Resultados indexados pelo ID da tarefa
+        """
+        self._results.update(results)
+        self._backend.save_results(results)
+    
+    def _set_status(self, task: Task, status: TaskStatus) -> None:
+        """
+        Alterar o status de uma tarefa mantendo os índices atualizados.
+        
+        Args:
+            task: Tarefa a atualizar
+            status: Novo status
+        """
+        priority = task.priority
+        task_id = task.id
+        
+        if task.status is _PENDING:
+            # Saiu da fila por outro caminho: a entrada no heap fica obsoleta
+            if self._queued.pop(task_id, None) is not None:
+                if len(self._pending) > 2 * len(self._queued) + PENDING_COMPACT_SLACK:
+                    self._compact_pending()
+        
+        del self._by_status[task.status][priority][task_id]
+        self._by_status[status][priority][task_id] = task
+        task.status = status
+    
+    def _complete_task(
+        self,
+        task: Task,
+        result: Dict[str, Any],
+        execution_time: float
+    ) -> TaskResult:
+        """
+        Registrar a conclusão bem-sucedida de uma tarefa.
+        
+        Args:
+            task: Tarefa processada
+            result: Dados retornados pelo handler
+            execution_time: Tempo da tentativa bem-sucedida em segundos
+            
+        Returns:
+            TaskResult com status COMPLETED
+        """
+        self._set_status(task, _COMPLETED)
+        completed_at = _now()
+        task.completed_at = completed_at
+        task.result = result
+        
+        task_result = TaskResult(
+            task_id=task.id,
+            status=_COMPLETED,
+            result=result,
+            execution_time=execution_time,
+            completed_at=completed_at
+        )
+        
+        self._completed_time_sum += execution_time
+        self._completed_count += 1
+        
+        logger.info(
+            "✓ Tarefa concluída com sucesso: %s (tempo: %.2fs)",
+            task.id, execution_time
+        )
+        
+        return task_result
+    
+    def _fail_task(
+        self,
+        task: Task,
+        error_msg: str,
+        execution_time: float
+    ) -> TaskResult:
+        """
+        Registrar a falha definitiva de uma tarefa.
+        
+        Args:
+            task: Tarefa processada
+            error_msg: Mensagem do último erro
+            execution_time: Tempo da última tentativa em segundos
+            
+        Returns:
+            TaskResult com status FAILED
+        """
+        self._set_status(task, _FAILED)
+        task.error = error_msg
+        completed_at = _now()
+        task.completed_at = completed_at
+        
+        task_result = TaskResult(
+            task_id=task.id,
+            status=_FAILED,
+            error=error_msg,
+            execution_time=execution_time,
+            completed_at=completed_at
+        )
+        
+        logger.error(
+            "Tarefa falhou permanentemente: %s (tentativas: %d/%d)",
+            task.id, task.retry_count, task.max_retries
+        )
+        
+        return task_result
     
     # ========================================================================
     # HANDLERS DE TAREFAS
     # ========================================================================
     
-    def _handle_send_email(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_send_email(self, payload: Dict[str, Any]) -> HandlerOutcome:
         """
         Handler para envio de email.
         
@@ -333,61 +1311,92 @@ class TaskProcessor:
             payload: Deve conter 'to' e 'subject'
             
         Returns:
-            Resultado do envio
+            Success com o resultado do envio
         """
-        logger.debug(f"Processando envio de email para: {payload.get('to')}")
-        time.sleep(1)  # Simular processamento
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processando envio de email para: %s", payload.get('to'))
+        await asyncio.sleep(1)  # Simular processamento
         
-        return {
+        return Success({
             'status': 'sent',
             'to': payload.get('to'),
             'subject': payload.get('subject'),
-            'timestamp': datetime.utcnow().isoformat()
-        }
+            'timestamp': _now_iso()
+        })
     
-    def _handle_generate_report(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_generate_report(self, payload: Dict[str, Any]) -> HandlerOutcome:
         """
         Handler para geração de relatório.
         
         Args:
-            payload: Deve conter 'report_type'
+            payload: Deve conter 'report_type' e opcionalmente 'values'
+                (dados numéricos a agregar)
             
         Returns:
-            Metadados do relatório gerado
+            Success com os metadados do relatório gerado
         """
-        logger.debug(f"Gerando relatório: {payload.get('report_type')}")
-        time.sleep(2)  # Simular processamento
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Gerando relatório: %s", payload.get('report_type'))
+        await asyncio.sleep(2)  # Simular processamento
         
-        return {
+        result = {
             'status': 'generated',
             'report_type': payload.get('report_type'),
-            'filename': f"report_{int(time.time())}.pdf",
+            'filename': f"report_{int(_now())}.pdf",
             'size_mb': 2.5,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': _now_iso()
         }
+        
+        # Agregação numérica roda no kernel compilado quando há numba, no
+        # pool de threads para não bloquear o event loop
+        if 'values' in payload:
+            loop = asyncio.get_running_loop()
+            result['summary'] = await loop.run_in_executor(
+                self._pool, aggregate_report, payload['values']
+            )
+        
+        return Success(result)
     
-    def _handle_process_image(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_process_image(self, payload: Dict[str, Any]) -> HandlerOutcome:
         """
         Handler para processamento de imagem.
         
         Args:
             payload: Deve conter 'image_path' e opcionalmente 'filters'
+                e 'pixels' (valores em escala de cinza, 0.0 a 1.0)
             
         Returns:
-            Resultado do processamento
+            Success com o resultado do processamento, ou Fatal
+                se algum filtro for desconhecido
         """
-        logger.debug(f"Processando imagem: {payload.get('image_path')}")
-        time.sleep(3)  # Simular processamento
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processando imagem: %s", payload.get('image_path'))
+        await asyncio.sleep(3)  # Simular processamento
         
-        return {
+        filters = payload.get('filters', [])
+        result = {
             'status': 'processed',
             'original_path': payload.get('image_path'),
             'output_path': f"processed_{payload.get('image_path')}",
-            'filters_applied': payload.get('filters', []),
-            'timestamp': datetime.utcnow().isoformat()
+            'filters_applied': filters,
+            'timestamp': _now_iso()
         }
+        
+        # Filtros sobre os pixels rodam no kernel compilado quando há numba, no
+        # pool de threads para não bloquear o event loop
+        if 'pixels' in payload:
+            loop = asyncio.get_running_loop()
+            try:
+                result['pixels'] = await loop.run_in_executor(
+                    self._pool, apply_filters, payload['pixels'], filters
+                )
+            except ValueError as e:
+                # Filtro inválido não se resolve com nova tentativa
+                return Fatal(str(e))
+        
+        return Success(result)
     
-    def _handle_sync_data(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_sync_data(self, payload: Dict[str, Any]) -> HandlerOutcome:
         """
         Handler para sincronização de dados.
         
@@ -395,20 +1404,21 @@ class TaskProcessor:
             payload: Deve conter 'source' e 'destination'
             
         Returns:
-            Resultado da sincronização
+            Success com o resultado da sincronização
         """
-        logger.debug(f"Sincronizando dados de: {payload.get('source')}")
-        time.sleep(2)  # Simular processamento
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sincronizando dados de: %s", payload.get('source'))
+        await asyncio.sleep(2)  # Simular processamento
         
-        return {
+        return Success({
             'status': 'synced',
             'source': payload.get('source'),
             'destination': payload.get('destination'),
             'records_synced': 1000,
-            'timestamp': datetime.utcnow().isoformat()
-        }
+            'timestamp': _now_iso()
+        })
     
-    def _handle_cleanup(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_cleanup(self, payload: Dict[str, Any]) -> HandlerOutcome:
         """
         Handler para limpeza de dados.
         
@@ -416,17 +1426,18 @@ class TaskProcessor:
             payload: Deve conter 'target'
             
         Returns:
-            Resultado da limpeza
+            Success com o resultado da limpeza
         """
-        logger.debug(f"Limpando dados: {payload.get('target')}")
-        time.sleep(1)  # Simular processamento
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Limpando dados: %s", payload.get('target'))
+        await asyncio.sleep(1)  # Simular processamento
         
-        return {
+        return Success({
             'status': 'cleaned',
             'target': payload.get('target'),
             'items_removed': 500,
-            'timestamp': datetime.utcnow().isoformat()
-        }
+            'timestamp': _now_iso()
+        })
     
     # ========================================================================
     # MÉTODOS DE CONSULTA
@@ -452,7 +1463,7 @@ class TaskProcessor:
             task_id: ID da tarefa
             
         Returns:
-            TaskResult ou None se não processada
+            TaskResult ou None se não processada (ou expirada do cache)
         """
         return self._results.get(task_id)
     
@@ -464,14 +1475,36 @@ class TaskProcessor:
             status: Status para filtrar (opcional)
             
         Returns:
-            Lista de tarefas ordenadas por prioridade
+            Lista de tarefas ordenadas por prioridade e, dentro da mesma
+            prioridade, por ordem de criação
         """
-        tasks = list(self._tasks.values())
+        by_priority = self._by_priority
         
-        if status:
-            tasks = [t for t in tasks if t.status == status]
+        if status is None:
+            tasks = self._tasks
+            return [tasks[i] for p in _PRIORITY_ORDER for i in by_priority[p]]
         
-        return sorted(tasks, key=lambda t: t.priority.value)
+        # Percorre apenas as tarefas do status pedido. Os buckets estão na
+        # ordem de entrada no status, quase igual à de criação: o sort
+        # (timsort) sobre dados quase ordenados fica próximo de O(k)
+        buckets = self._by_status[status]
+        listed: List[Task] = []
+        for p in _PRIORITY_ORDER:
+            creation = by_priority[p]
+            listed.extend(sorted(buckets[p].values(), key=lambda t: creation[t.id]))
+        return listed
+    
+    def _count_status(self, status: TaskStatus) -> int:
+        """
+        Contar tarefas em um status a partir do índice (sem varrer tarefas).
+        
+        Args:
+            status: Status a contar
+            
+        Returns:
+            Número de tarefas no status
+        """
+        return sum(len(bucket) for bucket in self._by_status[status].values())
     
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -480,26 +1513,22 @@ class TaskProcessor:
         Returns:
             Dicionário com estatísticas detalhadas
         """
-        all_tasks = list(self._tasks.values())
+        count = self._count_status
         
         stats = {
-            'total_tasks': len(all_tasks),
-            'pending': len([t for t in all_tasks if t.status == TaskStatus.PENDING]),
-            'processing': len([t for t in all_tasks if t.status == TaskStatus.PROCESSING]),
-            'completed': len([t for t in all_tasks if t.status == TaskStatus.COMPLETED]),
-            'failed': len([t for t in all_tasks if t.status == TaskStatus.FAILED]),
-            'retrying': len([t for t in all_tasks if t.status == TaskStatus.RETRYING]),
+            'total_tasks': len(self._tasks),
+            'pending': count(_PENDING),
+            'processing': count(_PROCESSING),
+            'completed': count(_COMPLETED),
+            'failed': count(_FAILED),
+            'retrying': count(_RETRYING),
         }
         
-        # Calcular tempo médio de execução
-        completed_results = [
-            r for r in self._results.values()
-            if r.status == TaskStatus.COMPLETED
-        ]
-        
-        if completed_results:
-            avg_time = sum(r.execution_time for r in completed_results) / len(completed_results)
-            stats['average_execution_time'] = avg_time
+        # Tempo médio de execução a partir dos acumuladores
+        if self._completed_count:
+            stats['average_execution_time'] = (
+                self._completed_time_sum / self._completed_count
+            )
         
         return stats
 
@@ -508,11 +1537,14 @@ class TaskProcessor:
 # EXEMPLO DE USO
 # ============================================================================
 
-def main() -> None:
+def main(verbose: bool = False) -> None:
     """
     Exemplo de uso do sistema de fila de tarefas.
     
     Demonstra criação, processamento e monitoramento de tarefas.
+    
+    Args:
+        verbose: Exibir os resultados em JSON indentado (legível)
     """
     
     print("\n" + "=" * 80)
@@ -569,9 +1601,11 @@ def main() -> None:
     print("\n⚙️  PROCESSANDO TAREFAS")
     print("-" * 80)
     
-    for task in tasks:
-        result = processor.process_task(task.id)
-        print(f"  {task.id}: {result.status.value}")
+    # Fila por prioridade: HIGH é iniciada antes de MEDIUM e LOW
+    results = asyncio.run(processor.run_pending())
+    processor.close()
+    for result in results:
+        print(f"  {result.task_id}: {result.status.name.lower()}")
     
     # Exibir resultados
     print("\n📊 RESULTADOS")
@@ -579,10 +1613,10 @@ def main() -> None:
     
     for task_id, result in processor._results.items():
         print(f"\nTarefa: {task_id}")
-        print(f"  Status: {result.status.value}")
+        print(f"  Status: {result.status.name.lower()}")
         print(f"  Tempo: {result.execution_time:.2f}s")
         if result.result:
-            print(f"  Resultado: {json.dumps(result.result, indent=2, ensure_ascii=False)}")
+            print(f"  Resultado: {_dumps(result.result, pretty=verbose).decode()}")
         if result.error:
             print(f"  Erro: {result.error}")
     
@@ -606,4 +1640,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    main(verbose='-v' in sys.argv[1:] or '--verbose' in sys.argv[1:])